@@ -6,27 +6,39 @@ Focused on extracting classes and their members with explicit access modifiers.
 
 import os
 import re
+import sys
 import json
 import gzip
+import hashlib
+import mmap
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from operator import attrgetter
 from pathlib import Path
 from datetime import datetime
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Optional
+from dataclasses import dataclass, asdict, is_dataclass
+from typing import Dict, Iterator, List, Optional
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder is used without it
+    orjson = None
 
-@dataclass
+
+# Fields are declared in output order and named like the JSON keys,
+# so members serialize straight into docs_index.json
+@dataclass(slots=True, kw_only=True)
 class Member:
     kind: str           # 'method', 'property', 'field', 'constructor', 'event'
     name: str
-    signature: str
     access_modifier: str  # 'public', 'private', 'internal', 'protected'
     modifiers: List[str]  # ['static', 'virtual', etc.]
     return_type: Optional[str] = None
-    line_number: Optional[int] = None
+    signature: str
+    line: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TypeInfo:
     name: str
     kind: str            # 'class', 'interface', 'struct', 'enum'
@@ -38,108 +50,230 @@ class TypeInfo:
     base_types: List[str] = None  # Base classes and interfaces
 
 
+# Simple, focused patterns
+
+# Identifier: patterns match raw bytes, where \w is ASCII only, so the UTF-8 bytes
+# of non-ASCII letters are allowed too (names like Façade stay whole)
+_IDENT = rb'[A-Za-z_][\w\x80-\xff]*'
+
+# Type patterns: require access modifier and capture inheritance
+_CLASS_RE = re.compile(
+    rb'^\s*(public|internal|protected|private)\s+'     # REQUIRED access modifier
+    rb'(?:(static|sealed|abstract|partial)\s+)*'       # Optional modifiers
+    rb'class\s+'                                        # 'class' keyword
+    rb'(' + _IDENT + rb')'                             # Class name
+    rb'(?:\s*:\s*([^{]+?))?'                           # Optional inheritance ": BaseClass, IInterface"
+    rb'\s*(?:\{|$)'                                    # Opening brace or end of line
+)
+
+_INTERFACE_RE = re.compile(
+    rb'^\s*(public|internal|protected|private)\s+'     # REQUIRED access modifier
+    rb'(?:(partial)\s+)*'                              # Optional modifiers
+    rb'interface\s+'                                   # 'interface' keyword
+    rb'(' + _IDENT + rb')'                             # Interface name
+    rb'(?:\s*:\s*([^{]+?))?'                           # Optional inheritance ": IBaseInterface"
+    rb'\s*(?:\{|$)'                                    # Opening brace or end of line
+)
+
+_STRUCT_RE = re.compile(
+    rb'^\s*(public|internal|protected|private)\s+'     # REQUIRED access modifier
+    rb'(?:(partial|readonly)\s+)*'                     # Optional modifiers
+    rb'struct\s+'                                      # 'struct' keyword
+    rb'(' + _IDENT + rb')'                             # Struct name
+    rb'(?:\s*:\s*([^{]+?))?'                           # Optional inheritance ": IInterface"
+    rb'\s*(?:\{|$)'                                    # Opening brace or end of line
+)
+
+_ENUM_RE = re.compile(
+    rb'^\s*(public|internal|protected|private)\s+'     # REQUIRED access modifier
+    rb'enum\s+'                                        # 'enum' keyword
+    rb'(' + _IDENT + rb')'                             # Enum name
+)
+
+# Member patterns: ALL require access modifiers
+_METHOD_RE = re.compile(
+    rb'^\s*(public|internal|protected|private)\s+'     # REQUIRED access modifier
+    rb'(?:(static|virtual|override|abstract|sealed|new|async)\s+)*'  # Optional modifiers
+    rb'(' + _IDENT + rb'(?:\[\])?(?:\?)?)\s+'          # Return type (simplified)
+    rb'(' + _IDENT + rb')\s*\('                        # Method name + opening paren
+)
+
+_PROPERTY_RE = re.compile(
+    rb'^\s*(public|internal|protected|private)\s+'     # REQUIRED access modifier
+    rb'(?:(static|virtual|override|abstract|sealed|new)\s+)*'  # Optional modifiers
+    rb'(' + _IDENT + rb'(?:\[\])?(?:\?)?)\s+'          # Property type
+    rb'(' + _IDENT + rb')\s*\{'                        # Property name + opening brace
+)
+
+_FIELD_RE = re.compile(
+    rb'^\s*(public|internal|protected|private)\s+'     # REQUIRED access modifier
+    rb'(?:(static|readonly|volatile)\s+)*'             # Optional modifiers (NO const!)
+    rb'(' + _IDENT + rb'(?:\[\])?(?:\?)?)\s+'          # Field type
+    rb'(' + _IDENT + rb')\s*[=;]'                      # Field name + = or ;
+)
+
+_CONSTRUCTOR_RE = re.compile(
+    rb'^\s*(public|internal|protected|private)\s+'     # REQUIRED access modifier
+    rb'(?:(static)\s+)?'                               # Optional static
+    rb'(' + _IDENT + rb')\s*\('                        # Constructor name (same as class)
+)
+
+_EVENT_RE = re.compile(
+    rb'^\s*(public|internal|protected|private)\s+'     # REQUIRED access modifier
+    rb'(?:(static|virtual|override|abstract|sealed|new)\s+)*'  # Optional modifiers
+    rb'event\s+'                                       # 'event' keyword
+    rb'(' + _IDENT + rb'(?:\[\])?(?:\?)?)\s+'          # Event type
+    rb'(' + _IDENT + rb')'                             # Event name
+)
+
+# Enum value pattern (no access modifier needed for enum values)
+_ENUM_VALUE_RE = re.compile(
+    rb'^\s*(' + _IDENT + rb')\s*(?:=\s*[^,}]+)?\s*[,}]?' # Enum value name, optional = value
+)
+
+# Interface member patterns (no access modifier - implicitly public)
+_INTERFACE_METHOD_RE = re.compile(
+    rb'^\s*(' + _IDENT + rb'(?:\[\])?(?:\?)?)\s+'      # Return type
+    rb'(' + _IDENT + rb')\s*\('                        # Method name + opening paren
+)
+
+_INTERFACE_PROPERTY_RE = re.compile(
+    rb'^\s*(' + _IDENT + rb'(?:\[\])?(?:\?)?)\s+'      # Property type
+    rb'(' + _IDENT + rb')\s*\{'                        # Property name + opening brace
+)
+
+_INTERFACE_EVENT_RE = re.compile(
+    rb'^\s*event\s+'                                   # 'event' keyword
+    rb'(' + _IDENT + rb'(?:\[\])?(?:\?)?)\s+'          # Event type
+    rb'(' + _IDENT + rb')'                             # Event name
+)
+
+# Tokens that steer each line to the one pattern that can match it
+_ACCESS_PREFIXES = (b'public', b'internal', b'protected', b'private')
+_ACCESS_MODIFIERS = frozenset(_ACCESS_PREFIXES)
+
+
+# Modifiers allowed between the access modifier and a type keyword
+_TYPE_MODIFIERS = frozenset({b'static', b'sealed', b'abstract', b'partial', b'readonly'})
+
+# Depth change for lines that are a single brace, as block braces usually sit on their own line
+_LONE_BRACE_DEPTH = {b'{': 1, b'}': -1}
+
+_TYPE_PATTERNS = {
+    b'class': _CLASS_RE,
+    b'interface': _INTERFACE_RE,
+    b'struct': _STRUCT_RE,
+    b'enum': _ENUM_RE,
+}
+
+# Combined patterns: one regex run per line, dispatched on the matching branch
+_BRANCH_WIDTHS = {}
+
+
+def _combine_patterns(**patterns: re.Pattern) -> re.Pattern:
+    """Join patterns into one alternation, wrapping each in a named group.
+
+    Branches are tried in order, so the first pattern that matches wins,
+    exactly as if the patterns were probed one after another.
+    """
+    combined = re.compile(b'|'.join(
+        b'(?P<%s>%s)' % (name.encode('ascii'), pattern.pattern) for name, pattern in patterns.items()
+    ))
+    _BRANCH_WIDTHS[combined] = {name: pattern.groups for name, pattern in patterns.items()}
+    return combined
+
+
+def _branch_groups(match: re.Match) -> tuple:
+    """Return the name of the matching branch and that branch's own groups."""
+    start = match.lastindex
+    width = _BRANCH_WIDTHS[match.re][match.lastgroup]
+    return match.lastgroup, _decode_groups(match.groups()[start:start + width])
+
+
+def _decode_groups(groups: tuple) -> List[Optional[str]]:
+    """Decode matched byte groups to text; unmatched optional groups stay None.
+
+    Results are interned: access modifiers, type names and member names repeat
+    across thousands of declarations and can then share one string object.
+    """
+    return [sys.intern(g.decode('utf-8', 'ignore')) if g is not None else None for g in groups]
+
+
+_NON_CONSTRUCTOR_MEMBER_RE = _combine_patterns(
+    method=_METHOD_RE, property=_PROPERTY_RE, field=_FIELD_RE, event=_EVENT_RE
+)
+
+_MEMBER_RE = _combine_patterns(
+    constructor=_CONSTRUCTOR_RE,
+    method=_METHOD_RE, property=_PROPERTY_RE, field=_FIELD_RE, event=_EVENT_RE
+)
+
+_INTERFACE_MEMBER_RE = _combine_patterns(
+    method=_INTERFACE_METHOD_RE, property=_INTERFACE_PROPERTY_RE, event=_INTERFACE_EVENT_RE
+)
+
+
+def find_files(directory: str, suffix: str) -> Iterator[str]:
+    """Recursively yield paths of files whose names end with suffix.
+
+    Uses os.scandir's cached entry types; symlinked directories are not followed
+    and unreadable directories are skipped, as Path.rglob does.
+    An empty directory means the current one, with paths yielded relative to it.
+    """
+    subdirs = []
+    try:
+        with os.scandir(directory or os.curdir) as entries:
+            for entry in entries:
+                path = os.path.join(directory, entry.name)
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(path)
+                elif entry.name.endswith(suffix):
+                    yield path
+    except OSError:
+        return
+    
+    for subdir in subdirs:
+        yield from find_files(subdir, suffix)
+
+
+# Files larger than this are memory-mapped; below it mmap setup costs more than it saves
+_MMAP_MIN_SIZE = 64 * 1024
+
+
+def iter_lines(f) -> Iterator[bytes]:
+    """Iterate the lines of a file opened in binary mode.
+
+    Large files are memory-mapped so lines are sliced straight from the page
+    cache instead of being copied through the buffered IO layer.
+    """
+    if os.fstat(f.fileno()).st_size <= _MMAP_MIN_SIZE:
+        return f
+    return _iter_mapped_lines(f)
+
+
+def _iter_mapped_lines(f) -> Iterator[bytes]:
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        yield from iter(mm.readline, b'')
+
+
 class SimpleCSParser:
-    def __init__(self):
-        # Simple, focused patterns
-        
-        # Type patterns: require access modifier and capture inheritance
-        self.class_pattern = re.compile(
-            r'^\s*(public|internal|protected|private)\s+'     # REQUIRED access modifier
-            r'(?:(static|sealed|abstract|partial)\s+)*'       # Optional modifiers
-            r'class\s+'                                        # 'class' keyword
-            r'([A-Za-z_]\w*)'                                 # Class name
-            r'(?:\s*:\s*([^{]+?))?'                           # Optional inheritance ": BaseClass, IInterface"
-            r'\s*(?:\{|$)'                                    # Opening brace or end of line
-        )
-        
-        self.interface_pattern = re.compile(
-            r'^\s*(public|internal|protected|private)\s+'     # REQUIRED access modifier
-            r'(?:(partial)\s+)*'                              # Optional modifiers
-            r'interface\s+'                                   # 'interface' keyword
-            r'([A-Za-z_]\w*)'                                 # Interface name
-            r'(?:\s*:\s*([^{]+?))?'                           # Optional inheritance ": IBaseInterface"
-            r'\s*(?:\{|$)'                                    # Opening brace or end of line
-        )
-        
-        self.struct_pattern = re.compile(
-            r'^\s*(public|internal|protected|private)\s+'     # REQUIRED access modifier
-            r'(?:(partial|readonly)\s+)*'                     # Optional modifiers
-            r'struct\s+'                                      # 'struct' keyword
-            r'([A-Za-z_]\w*)'                                 # Struct name
-            r'(?:\s*:\s*([^{]+?))?'                           # Optional inheritance ": IInterface"
-            r'\s*(?:\{|$)'                                    # Opening brace or end of line
-        )
-        
-        self.enum_pattern = re.compile(
-            r'^\s*(public|internal|protected|private)\s+'     # REQUIRED access modifier
-            r'enum\s+'                                        # 'enum' keyword
-            r'([A-Za-z_]\w*)'                                 # Enum name
-        )
-        
-        # Member patterns: ALL require access modifiers
-        self.method_pattern = re.compile(
-            r'^\s*(public|internal|protected|private)\s+'     # REQUIRED access modifier
-            r'(?:(static|virtual|override|abstract|sealed|new|async)\s+)*'  # Optional modifiers
-            r'([A-Za-z_]\w*(?:\[\])?(?:\?)?)\s+'              # Return type (simplified)
-            r'([A-Za-z_]\w*)\s*\('                            # Method name + opening paren
-        )
-        
-        self.property_pattern = re.compile(
-            r'^\s*(public|internal|protected|private)\s+'     # REQUIRED access modifier
-            r'(?:(static|virtual|override|abstract|sealed|new)\s+)*'  # Optional modifiers
-            r'([A-Za-z_]\w*(?:\[\])?(?:\?)?)\s+'              # Property type
-            r'([A-Za-z_]\w*)\s*\{'                            # Property name + opening brace
-        )
-        
-        self.field_pattern = re.compile(
-            r'^\s*(public|internal|protected|private)\s+'     # REQUIRED access modifier
-            r'(?:(static|readonly|volatile)\s+)*'             # Optional modifiers (NO const!)
-            r'([A-Za-z_]\w*(?:\[\])?(?:\?)?)\s+'              # Field type
-            r'([A-Za-z_]\w*)\s*[=;]'                          # Field name + = or ;
-        )
-        
-        self.constructor_pattern = re.compile(
-            r'^\s*(public|internal|protected|private)\s+'     # REQUIRED access modifier
-            r'(?:(static)\s+)?'                               # Optional static
-            r'([A-Za-z_]\w*)\s*\('                            # Constructor name (same as class)
-        )
-        
-        self.event_pattern = re.compile(
-            r'^\s*(public|internal|protected|private)\s+'     # REQUIRED access modifier
-            r'(?:(static|virtual|override|abstract|sealed|new)\s+)*'  # Optional modifiers
-            r'event\s+'                                       # 'event' keyword
-            r'([A-Za-z_]\w*(?:\[\])?(?:\?)?)\s+'              # Event type
-            r'([A-Za-z_]\w*)'                                 # Event name
-        )
-        
-        # Enum value pattern (no access modifier needed for enum values)
-        self.enum_value_pattern = re.compile(
-            r'^\s*([A-Za-z_]\w*)\s*(?:=\s*[^,}]+)?\s*[,}]?'   # Enum value name, optional = value
-        )
-        
-        # Interface member patterns (no access modifier - implicitly public)
-        self.interface_method_pattern = re.compile(
-            r'^\s*([A-Za-z_]\w*(?:\[\])?(?:\?)?)\s+'           # Return type
-            r'([A-Za-z_]\w*)\s*\('                            # Method name + opening paren
-        )
-        
-        self.interface_property_pattern = re.compile(
-            r'^\s*([A-Za-z_]\w*(?:\[\])?(?:\?)?)\s+'           # Property type
-            r'([A-Za-z_]\w*)\s*\{'                            # Property name + opening brace
-        )
-        
-        self.interface_event_pattern = re.compile(
-            r'^\s*event\s+'                                   # 'event' keyword
-            r'([A-Za-z_]\w*(?:\[\])?(?:\?)?)\s+'              # Event type
-            r'([A-Za-z_]\w*)'                                 # Event name
-        )
+    # Patterns are compiled once at import time and shared by every instance
+    enum_value_pattern = _ENUM_VALUE_RE
+    member_pattern = _MEMBER_RE
+    non_constructor_member_pattern = _NON_CONSTRUCTOR_MEMBER_RE
+    interface_member_pattern = _INTERFACE_MEMBER_RE
 
-    def strip_comments(self, line: str) -> str:
+    def strip_comments(self, line: bytes) -> bytes:
         """Remove comments from a line."""
-        if '//' in line:
-            line = line[:line.index('//')]
-        return line.strip()
+        return line.partition(b'//')[0].strip()
     
+    def type_keyword(self, tokens: List[bytes]) -> Optional[bytes]:
+        """Return the first token after the access modifier that is not a type modifier."""
+        for token in tokens[1:]:
+            if token not in _TYPE_MODIFIERS:
+                return token
+        return None
+
     def parse_base_types(self, inheritance_str: str) -> List[str]:
         """Parse inheritance string into list of base types."""
         if not inheritance_str:
@@ -157,307 +291,343 @@ class SimpleCSParser:
         
         return base_types
 
-    def parse_file(self, file_path: Path) -> List[TypeInfo]:
-        """Parse a single C# file and extract types (classes, interfaces, structs, enums)."""
-        types = []
+    def parse_enum_value(self, stripped: bytes, tokens: List[bytes],
+                         type_info: TypeInfo, line_num: int) -> Optional[Member]:
+        """Parse an enum value line (no access modifier needed for enum values)."""
+        # Enum value names start with a letter or underscore
+        if not (stripped[:1].isalpha() or stripped.startswith(b'_')):
+            return None
         
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-        except Exception as e:
-            print(f"Warning: Could not read {file_path}: {e}")
-            return types
-
-        current_type = None
-        brace_depth = 0
+        enum_value_match = self.enum_value_pattern.match(stripped)
+        if not enum_value_match or not enum_value_match.group(1):
+            return None
         
-        for line_num, line in enumerate(lines, 1):
-            stripped = self.strip_comments(line)
-            if not stripped:
-                continue
+        (value_name,) = _decode_groups(enum_value_match.groups())
+        # Skip if it looks like a method or property (contains parentheses or spaces)
+        if '(' in value_name or value_name.isspace():
+            return None
+        
+        return Member(
+            kind='enum_value',
+            name=value_name,
+            signature=stripped.decode('utf-8', 'ignore'),
+            access_modifier='public',  # Enum values are always public
+            modifiers=['public'],
+            line=line_num
+        )
 
-            # Track brace depth
-            brace_depth += stripped.count('{') - stripped.count('}')
+    def parse_interface_member(self, stripped: bytes, tokens: List[bytes],
+                               type_info: TypeInfo, line_num: int) -> Optional[Member]:
+        """Parse an interface method, property or event (implicitly public)."""
+        # Methods need '(', properties '{', events lead with 'event'
+        if not (b'(' in stripped or b'{' in stripped or tokens[0] == b'event'):
+            return None
+        
+        member_match = self.interface_member_pattern.match(stripped)
+        if not member_match:
+            return None
+        
+        member_kind, (member_type, member_name) = _branch_groups(member_match)
+        return Member(
+            kind=member_kind,
+            name=member_name,
+            signature=stripped.decode('utf-8', 'ignore'),
+            access_modifier='public',  # Interface members are implicitly public
+            modifiers=['public'],
+            return_type=member_type,
+            line=line_num
+        )
 
-            # Look for type declarations
-            type_match = None
-            type_kind = None
-            
-            # Check for class
-            class_match = self.class_pattern.match(stripped)
-            if class_match:
-                type_match = class_match
-                type_kind = 'class'
-            
-            # Check for interface
-            interface_match = self.interface_pattern.match(stripped)
-            if interface_match:
-                type_match = interface_match
-                type_kind = 'interface'
-            
-            # Check for struct
-            struct_match = self.struct_pattern.match(stripped)
-            if struct_match:
-                type_match = struct_match
-                type_kind = 'struct'
-            
-            # Check for enum
-            enum_match = self.enum_pattern.match(stripped)
-            if enum_match:
-                access_modifier = enum_match.group(1)
-                type_name = enum_match.group(2)
-                
-                current_type = TypeInfo(
-                    name=type_name,
-                    kind='enum',
-                    access_modifier=access_modifier,
-                    modifiers=[access_modifier],
-                    file_path=str(file_path),
-                    line_number=line_num,
-                    members=[],
-                    base_types=[]
-                )
-                types.append(current_type)
-                continue
+    def parse_class_member(self, stripped: bytes, tokens: List[bytes],
+                           type_info: TypeInfo, line_num: int) -> Optional[Member]:
+        """Parse a class or struct constructor, method, property, field
+        (excludes const automatically!) or event."""
+        if tokens[0] not in _ACCESS_MODIFIERS:
+            return None
+        
+        # Every member has '(', '{', '=' or ';', or else the 'event' keyword
+        if not (b'(' in stripped or b'{' in stripped or b'=' in stripped
+                or b';' in stripped or b'event' in tokens):
+            return None
+        
+        member_match = self.member_pattern.match(stripped)
+        if not member_match:
+            return None
+        
+        member_kind, groups = _branch_groups(member_match)
+        if member_kind == 'constructor':
+            access_modifier, static_str, constructor_name = groups
             
-            # Handle other types (class, interface, struct)
-            if type_match and type_kind:
-                access_modifier = type_match.group(1)
-                modifiers_str = type_match.group(2) or ""
-                type_name = type_match.group(3)
-                inheritance_str = type_match.group(4) or ""
-                
+            # Constructors must match the type name
+            if constructor_name == type_info.name:
                 modifiers = [access_modifier]
-                if modifiers_str:
-                    modifiers.extend(modifiers_str.split())
+                if static_str == "static":
+                    modifiers.append("static")
                 
-                base_types = self.parse_base_types(inheritance_str)
-                
-                current_type = TypeInfo(
-                    name=type_name,
-                    kind=type_kind,
+                return Member(
+                    kind='constructor',
+                    name=type_info.name,
+                    signature=stripped.decode('utf-8', 'ignore'),
                     access_modifier=access_modifier,
                     modifiers=modifiers,
-                    file_path=str(file_path),
-                    line_number=line_num,
-                    members=[],
-                    base_types=base_types
+                    line=line_num
                 )
-                types.append(current_type)
-                continue
-
-            # If we're inside a type, look for members
-            if current_type and brace_depth > 0:
-                # For enums, look for enum values
-                if current_type.kind == 'enum':
-                    enum_value_match = self.enum_value_pattern.match(stripped)
-                    if enum_value_match and enum_value_match.group(1):
-                        value_name = enum_value_match.group(1)
-                        # Skip if it looks like a method or property (contains parentheses or spaces)
-                        if '(' not in value_name and not value_name.isspace():
-                            current_type.members.append(Member(
-                                kind='enum_value',
-                                name=value_name,
-                                signature=stripped,
-                                access_modifier='public',  # Enum values are always public
-                                modifiers=['public'],
-                                line_number=line_num
-                            ))
-                    continue
-                
-                # For classes and structs, check for constructors (must match type name)
-                if current_type.kind in ['class', 'struct']:
-                    constructor_match = self.constructor_pattern.match(stripped)
-                    if constructor_match and constructor_match.group(3) == current_type.name:
-                        access_modifier = constructor_match.group(1)
-                        is_static = constructor_match.group(2) == "static"
-                        
-                        modifiers = [access_modifier]
-                        if is_static:
-                            modifiers.append("static")
-                        
-                        current_type.members.append(Member(
-                            kind='constructor',
-                            name=current_type.name,
-                            signature=stripped,
-                            access_modifier=access_modifier,
-                            modifiers=modifiers,
-                            line_number=line_num
-                        ))
-                        continue
+            
+            # Not this type's constructor; the line may still be another member
+            member_match = self.non_constructor_member_pattern.match(stripped)
+            if not member_match:
+                return None
+            member_kind, groups = _branch_groups(member_match)
+        
+        access_modifier, modifiers_str, member_type, member_name = groups
+        
+        modifiers = [access_modifier]
+        if modifiers_str:
+            modifiers.extend(map(sys.intern, modifiers_str.split()))
+        
+        return Member(
+            kind=member_kind,
+            name=member_name,
+            signature=stripped.decode('utf-8', 'ignore'),
+            access_modifier=access_modifier,
+            modifiers=modifiers,
+            return_type=member_type,
+            line=line_num
+        )
 
-                # Check for methods (classes, interfaces, structs can have methods)
-                if current_type.kind in ['class', 'struct']:
-                    method_match = self.method_pattern.match(stripped)
-                    if method_match:
-                        access_modifier = method_match.group(1)
-                        modifiers_str = method_match.group(2) or ""
-                        return_type = method_match.group(3)
-                        method_name = method_match.group(4)
-                        
-                        modifiers = [access_modifier]
-                        if modifiers_str:
-                            modifiers.extend(modifiers_str.split())
-                        
-                        current_type.members.append(Member(
-                            kind='method',
-                            name=method_name,
-                            signature=stripped,
-                            access_modifier=access_modifier,
-                            modifiers=modifiers,
-                            return_type=return_type,
-                            line_number=line_num
-                        ))
-                        continue
-                
-                # Special handling for interface methods (no access modifier required)
-                if current_type.kind == 'interface':
-                    interface_method_match = self.interface_method_pattern.match(stripped)
-                    if interface_method_match:
-                        return_type = interface_method_match.group(1)
-                        method_name = interface_method_match.group(2)
-                        
-                        current_type.members.append(Member(
-                            kind='method',
-                            name=method_name,
-                            signature=stripped,
-                            access_modifier='public',  # Interface members are implicitly public
-                            modifiers=['public'],
-                            return_type=return_type,
-                            line_number=line_num
-                        ))
-                        continue
+    def parse_file(self, file_path: str) -> List[TypeInfo]:
+        """Parse a single C# file and extract types (classes, interfaces, structs, enums).
 
-                # Check for properties (classes and structs need access modifiers)
-                if current_type.kind in ['class', 'struct']:
-                    property_match = self.property_pattern.match(stripped)
-                    if property_match:
-                        access_modifier = property_match.group(1)
-                        modifiers_str = property_match.group(2) or ""
-                        property_type = property_match.group(3)
-                        property_name = property_match.group(4)
-                        
-                        modifiers = [access_modifier]
-                        if modifiers_str:
-                            modifiers.extend(modifiers_str.split())
-                        
-                        current_type.members.append(Member(
-                            kind='property',
-                            name=property_name,
-                            signature=stripped,
-                            access_modifier=access_modifier,
-                            modifiers=modifiers,
-                            return_type=property_type,
-                            line_number=line_num
-                        ))
+        Lines are matched as raw bytes (keywords are ASCII; identifiers may carry
+        UTF-8 bytes); only the names and signatures that get stored are decoded.
+        """
+        types = []
+        
+        current_type = None
+        brace_depth = 0
+        
+        # Member parser for each type kind, and whether its members need an access modifier
+        member_parsers = {
+            'class': (self.parse_class_member, True),
+            'struct': (self.parse_class_member, True),
+            'interface': (self.parse_interface_member, False),
+            'enum': (self.parse_enum_value, False),
+        }
+        parse_member = None
+        access_required = True  # Outside any type, only type declarations matter
+        
+        # Resolve per-line attribute lookups once, outside the loop
+        strip_comments = self.strip_comments
+        file_path_str = str(file_path)
+        
+        # Lines are read lazily, so a read error can surface mid-file as well as on open
+        try:
+            with open(file_path, 'rb') as f:
+                for line_num, line in enumerate(iter_lines(f), 1):
+                    stripped = strip_comments(line)
+                    if not stripped:
                         continue
-                
-                # Special handling for interface properties (no access modifier required)
-                if current_type.kind == 'interface':
-                    interface_property_match = self.interface_property_pattern.match(stripped)
-                    if interface_property_match:
-                        property_type = interface_property_match.group(1)
-                        property_name = interface_property_match.group(2)
-                        
-                        current_type.members.append(Member(
-                            kind='property',
-                            name=property_name,
-                            signature=stripped,
-                            access_modifier='public',  # Interface members are implicitly public
-                            modifiers=['public'],
-                            return_type=property_type,
-                            line_number=line_num
-                        ))
+
+                    # Track brace depth. A lone brace line holds nothing else to parse;
+                    # most other lines have no braces, so test before counting.
+                    lone_brace = _LONE_BRACE_DEPTH.get(stripped)
+                    if lone_brace is not None:
+                        brace_depth += lone_brace
                         continue
+                    if b'{' in stripped or b'}' in stripped:
+                        brace_depth += stripped.count(b'{') - stripped.count(b'}')
 
-                # Check for fields (classes and structs can have fields, excludes const automatically!)
-                if current_type.kind in ['class', 'struct']:
-                    field_match = self.field_pattern.match(stripped)
-                    if field_match:
-                        access_modifier = field_match.group(1)
-                        modifiers_str = field_match.group(2) or ""
-                        field_type = field_match.group(3)
-                        field_name = field_match.group(4)
-                        
-                        modifiers = [access_modifier]
-                        if modifiers_str:
-                            modifiers.extend(modifiers_str.split())
-                        
-                        current_type.members.append(Member(
-                            kind='field',
-                            name=field_name,
-                            signature=stripped,
-                            access_modifier=access_modifier,
-                            modifiers=modifiers,
-                            return_type=field_type,
-                            line_number=line_num
-                        ))
+                    # Skip body code with a prefix check before any tokenizing or regex work
+                    if access_required and not stripped.startswith(_ACCESS_PREFIXES):
                         continue
 
-                # Check for events (classes and structs need access modifiers)
-                if current_type.kind in ['class', 'struct']:
-                    event_match = self.event_pattern.match(stripped)
-                    if event_match:
-                        access_modifier = event_match.group(1)
-                        modifiers_str = event_match.group(2) or ""
-                        event_type = event_match.group(3)
-                        event_name = event_match.group(4)
+                    # Split once; declarations are recognised by their leading tokens
+                    tokens = stripped.split()
+
+                    # Look for type declarations: access modifier, type modifiers, then keyword
+                    type_match = None
+                    if tokens[0] in _ACCESS_MODIFIERS:
+                        type_kind = self.type_keyword(tokens)
+                        type_pattern = _TYPE_PATTERNS.get(type_kind)
+                        if type_pattern:
+                            type_match = type_pattern.match(stripped)
+                
+                    if type_match:
+                        if type_kind == b'enum':
+                            access_modifier, type_name = _decode_groups(type_match.groups())
                         
-                        modifiers = [access_modifier]
-                        if modifiers_str:
-                            modifiers.extend(modifiers_str.split())
+                            current_type = TypeInfo(
+                                name=type_name,
+                                kind='enum',
+                                access_modifier=access_modifier,
+                                modifiers=[access_modifier],
+                                file_path=file_path_str,
+                                line_number=line_num,
+                                members=[],
+                                base_types=[]
+                            )
+                        else:
+                            access_modifier, modifiers_str, type_name, inheritance_str = _decode_groups(type_match.groups())
                         
-                        current_type.members.append(Member(
-                            kind='event',
-                            name=event_name,
-                            signature=stripped,
-                            access_modifier=access_modifier,
-                            modifiers=modifiers,
-                            return_type=event_type,
-                            line_number=line_num
-                        ))
-                        continue
-                
-                # Special handling for interface events (no access modifier required)
-                if current_type.kind == 'interface':
-                    interface_event_match = self.interface_event_pattern.match(stripped)
-                    if interface_event_match:
-                        event_type = interface_event_match.group(1)
-                        event_name = interface_event_match.group(2)
+                            modifiers = [access_modifier]
+                            if modifiers_str:
+                                modifiers.extend(map(sys.intern, modifiers_str.split()))
+                        
+                            base_types = self.parse_base_types(inheritance_str or "")
                         
-                        current_type.members.append(Member(
-                            kind='event',
-                            name=event_name,
-                            signature=stripped,
-                            access_modifier='public',  # Interface members are implicitly public
-                            modifiers=['public'],
-                            return_type=event_type,
-                            line_number=line_num
-                        ))
+                            current_type = TypeInfo(
+                                name=type_name,
+                                kind=sys.intern(type_kind.decode('ascii')),
+                                access_modifier=access_modifier,
+                                modifiers=modifiers,
+                                file_path=file_path_str,
+                                line_number=line_num,
+                                members=[],
+                                base_types=base_types
+                            )
+                        types.append(current_type)
+                    
+                        # Choose the member parser once per type rather than per line
+                        parse_member, access_required = member_parsers[current_type.kind]
                         continue
 
+                    # If we're inside a type, look for members
+                    if current_type and brace_depth > 0:
+                        member = parse_member(stripped, tokens, current_type, line_num)
+                        if member:
+                            current_type.members.append(member)
+        except Exception as e:
+            print(f"Warning: Could not read {file_path}: {e}")
+            return []
+
         return types
 
-    def scan_directory(self, root_path: Path) -> List[TypeInfo]:
-        """Scan directory for C# files and extract all types."""
+    def scan_directory(self, root_path: Path, max_workers: Optional[int] = None,
+                       cache_file: Optional[str] = None) -> List[TypeInfo]:
+        """Scan directory for C# files and extract all types.
+
+        Files are parsed in parallel worker processes (one per CPU unless
+        max_workers is given); results keep the order of the file list.
+        With a cache_file, files whose mtime and size are unchanged since the
+        last run reuse their cached types instead of being parsed again.
+        """
         all_types = []
         
-        # Find all .cs files
-        cs_files = list(root_path.rglob('*.cs'))
+        # Find all .cs files (paths stay plain strings; '.' adds no prefix, as with rglob)
+        root = str(root_path)
+        cs_files = list(find_files('' if root == os.curdir else root, '.cs'))
         print(f"Found {len(cs_files)} C# files")
         
-        for file_path in cs_files:
-            types = self.parse_file(file_path)
-            all_types.extend(types)
+        cache = load_parse_cache(cache_file) if cache_file else {}
+        file_types = {}
+        stale_files = []
+        for path in cs_files:
+            # Without a cache every file is stale; an unstattable one (dangling
+            # symlink, deleted since listing) is too, and parse_file reports it
+            mtime_ns = size = None
+            if cache_file:
+                try:
+                    st = os.stat(path)
+                    mtime_ns, size = st.st_mtime_ns, st.st_size
+                except OSError:
+                    pass
+            
+            entry = cache.get(path) if mtime_ns is not None else None
+            if entry and entry[0] == mtime_ns and entry[1] == size:
+                file_types[path] = (mtime_ns, size, types_from_cache(entry[2]))
+            else:
+                file_types[path] = (mtime_ns, size, None)
+                stale_files.append(path)
+        
+        if cache_file:
+            print(f"Reusing {len(cs_files) - len(stale_files)} cached files, parsing {len(stale_files)}")
+        
+        if stale_files:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                for path, types in zip(stale_files, executor.map(self.parse_file, stale_files, chunksize=32)):
+                    mtime_ns, size, _ = file_types[path]
+                    file_types[path] = (mtime_ns, size, types)
+        
+        for path in cs_files:
+            all_types.extend(file_types[path][2])
+        
+        if cache_file:
+            # Files that could not be stat'ed are parsed again next time
+            save_parse_cache(cache_file, {path: entry for path, entry in file_types.items()
+                                          if entry[0] is not None})
         
         return all_types
 
 
-def generate_documentation(types: List[TypeInfo], output_file: str, compress: bool = False):
+# Cached results are only valid for the parser that produced them, so the
+# cache is tagged with a hash of this module's source
+_PARSER_VERSION = hashlib.sha1(Path(__file__).read_bytes()).hexdigest()
+
+
+def load_parse_cache(cache_file: str) -> Dict[str, list]:
+    """Load the per-file parse cache: path -> [mtime_ns, size, types].
+
+    A missing, unreadable or outdated cache is treated as empty.
+    """
+    try:
+        with open(cache_file, 'rb') as f:
+            content = f.read()
+        data = orjson.loads(content) if orjson is not None else json.loads(content)
+    except (OSError, ValueError):
+        return {}
+    
+    if not isinstance(data, dict) or data.get('version') != _PARSER_VERSION:
+        return {}
+    return data.get('files', {})
+
+
+def save_parse_cache(cache_file: str, file_types: Dict[str, tuple]):
+    """Write the per-file parse cache for the files seen in this run."""
+    data = {
+        'version': _PARSER_VERSION,
+        'files': file_types
+    }
+    try:
+        with open(cache_file, 'wb') as f:
+            f.write(encode_json(data, compact=True))
+    except OSError as e:
+        print(f"Warning: Could not write cache {cache_file}: {e}")
+
+
+def types_from_cache(entries: List[Dict]) -> List[TypeInfo]:
+    """Rebuild TypeInfo objects from their cached dict form."""
+    types = []
+    for entry in entries:
+        members = [Member(**member) for member in entry['members']]
+        types.append(TypeInfo(**{**entry, 'members': members}))
+    return types
+
+
+def encode_json(data: Dict, compact: bool = False) -> bytes:
+    """Encode data as UTF-8 JSON, indented unless compact, using orjson when installed."""
+    if orjson is not None:
+        # orjson serializes dataclasses natively
+        return orjson.dumps(data, option=0 if compact else orjson.OPT_INDENT_2)
+    
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':'),
+                          default=_dataclass_to_dict).encode('utf-8')
+    return json.dumps(data, indent=2, ensure_ascii=False, default=_dataclass_to_dict).encode('utf-8')
+
+
+def _dataclass_to_dict(obj):
+    """json.dumps fallback for objects the stdlib encoder does not know."""
+    if is_dataclass(obj):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def generate_documentation(types: List[TypeInfo], output_file: str, compress: bool = False,
+                           compact: bool = False):
     """Generate JSON documentation."""
     
     # Sort types by file path then by name
-    sorted_types = sorted(types, key=lambda t: (t.file_path, t.name))
+    sorted_types = sorted(types, key=attrgetter('file_path', 'name'))
     
     # Count types by kind
     type_counts = {}
@@ -475,7 +645,7 @@ def generate_documentation(types: List[TypeInfo], output_file: str, compress: bo
     
     for type_info in sorted_types:
         # Sort members by kind then by name
-        sorted_members = sorted(type_info.members, key=lambda m: (m.kind, m.name))
+        sorted_members = sorted(type_info.members, key=attrgetter('kind', 'name'))
         
         type_data = {
             'name': type_info.name,
@@ -486,23 +656,12 @@ def generate_documentation(types: List[TypeInfo], output_file: str, compress: bo
             'file': type_info.file_path,
             'line': type_info.line_number,
             'member_count': len(sorted_members),
-            'members': [
-                {
-                    'kind': member.kind,
-                    'name': member.name,
-                    'access_modifier': member.access_modifier,
-                    'modifiers': member.modifiers,
-                    'return_type': member.return_type,
-                    'signature': member.signature,
-                    'line': member.line_number
-                }
-                for member in sorted_members
-            ]
+            'members': sorted_members  # Member dataclasses are encoded directly
         }
         output_data['types'].append(type_data)
     
-    # Convert to JSON string first
-    json_content = json.dumps(output_data, indent=2, ensure_ascii=False)
+    # Encode to JSON bytes first
+    json_content = encode_json(output_data, compact=compact)
     
     # Write file (compressed or uncompressed)
     if compress:
@@ -510,11 +669,11 @@ def generate_documentation(types: List[TypeInfo], output_file: str, compress: bo
         if not output_file.endswith('.gz'):
             output_file += '.gz'
         
-        with gzip.open(output_file, 'wt', encoding='utf-8') as f:
+        with gzip.open(output_file, 'wb') as f:
             f.write(json_content)
         
         # Calculate compression ratio
-        uncompressed_size = len(json_content.encode('utf-8'))
+        uncompressed_size = len(json_content)
         compressed_size = os.path.getsize(output_file)
         compression_ratio = (1 - compressed_size / uncompressed_size) * 100
         
@@ -523,7 +682,7 @@ def generate_documentation(types: List[TypeInfo], output_file: str, compress: bo
         print(f"Compressed size: {compressed_size:,} bytes ({compressed_size / 1024 / 1024:.1f} MB)")
         print(f"Compression ratio: {compression_ratio:.1f}%")
     else:
-        with open(output_file, 'w', encoding='utf-8') as f:
+        with open(output_file, 'wb') as f:
             f.write(json_content)
         
         file_size = os.path.getsize(output_file)
@@ -535,12 +694,28 @@ def generate_documentation(types: List[TypeInfo], output_file: str, compress: bo
     print(f"Total members: {output_data['total_members']}")
 
 
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
 def main():
     parser = argparse.ArgumentParser(description='Enhanced C# Documentation Generator')
     parser.add_argument('--root', default='.', help='Root directory to scan')
     parser.add_argument('--output', default='docs_enhanced.json', help='Output JSON file')
     parser.add_argument('--compress', '-c', action='store_true', 
                        help='Compress output using gzip (adds .gz extension)')
+    parser.add_argument('--compact', action='store_true',
+                       help='Write compact JSON without indentation')
+    parser.add_argument('--jobs', '-j', type=positive_int, default=None,
+                       help='Number of parser processes (default: number of CPUs)')
+    parser.add_argument('--cache', default='.docs_cache.json',
+                       help='Parse cache file; unchanged files are not parsed again')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Parse every file and do not read or write the cache')
     
     args = parser.parse_args()
     
@@ -553,10 +728,11 @@ def main():
     
     # Parse C# files
     cs_parser = SimpleCSParser()
-    types = cs_parser.scan_directory(root_path)
+    types = cs_parser.scan_directory(root_path, max_workers=args.jobs,
+                                     cache_file=None if args.no_cache else args.cache)
     
     # Generate documentation
-    generate_documentation(types, args.output, compress=args.compress)
+    generate_documentation(types, args.output, compress=args.compress, compact=args.compact)
     
     return 0
 
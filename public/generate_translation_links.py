@@ -5,19 +5,166 @@ Searches C# files for .Translate() calls and links them to XML translation keys.
 """
 
 import json
+import mmap
 import os
 import re
+import sys
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from dataclasses import dataclass
-from typing import List, Dict, Set
+from dataclasses import dataclass, asdict, is_dataclass
+from typing import List, Dict, Optional, Set, Tuple
 
-@dataclass
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder is used without it
+    orjson = None
+
+# .Translate() calls with parameters (actual replacements) are matched by
+# find_translate_keys as if by the regex
+#   ["']([^"']+)["']\.Translate\([^)]+\)|(\w+)\.Translate\([^)]+\)
+# i.e. "Key".Translate(param1, param2, ...) or Key.Translate(param1, param2, ...)
+_TRANSLATE_CALL = '.Translate('
+_TRANSLATE_CALL_BYTES = _TRANSLATE_CALL.encode('ascii')
+
+# Files larger than this are memory-mapped for the .Translate( sniff
+_MMAP_MIN_SIZE = 64 * 1024
+
+# Translation keys in XML content, in one alternation so the text is scanned once:
+# <key>TranslationKey</key> (groups 1-2) or key="TranslationKey" (groups 3-4)
+_XML_KEY_RE = re.compile(r'<(\w+)>([^<]+)</\1>|(\w+)="([^"]+)"')
+
+# Tag/attribute names whose values are always taken as translation keys
+_KEY_TAGS = frozenset({'key', 'defname', 'label', 'description', 'text'})
+
+def find_files(directory: str, suffix: str, found: List[str] = None) -> List[str]:
+    """Recursively list files whose names end with suffix, in os.walk order.
+
+    Uses os.scandir's cached entry types instead of os.walk's per-directory lists;
+    like os.walk, unreadable directories are skipped and symlinks are not followed.
+    """
+    if found is None:
+        found = []
+    
+    subdirs = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.endswith(suffix):
+                    found.append(entry.path)
+    except OSError:
+        return found
+    
+    # A directory's own files come before those of its subdirectories
+    for subdir in subdirs:
+        find_files(subdir, suffix, found)
+    
+    return found
+
+def read_translate_source(file_path: str) -> Optional[str]:
+    """Read a C# file as text, or return None if it has no .Translate( call.
+
+    The raw bytes are sniffed first so most files are never decoded; large files
+    are memory-mapped for the check. Invalid UTF-8 is replaced rather than failing
+    the whole file, and newlines are translated as in text mode.
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size > _MMAP_MIN_SIZE:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm.find(_TRANSLATE_CALL_BYTES) == -1:
+                    return None
+                data = mm[:]
+        else:
+            data = f.read()
+            if _TRANSLATE_CALL_BYTES not in data:
+                return None
+    
+    content = data.decode('utf-8', 'replace')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+def _is_word_char(c: str) -> bool:
+    # What \w matches in a str pattern
+    return c.isalnum() or c == '_'
+
+def _last_quote(content: str, start: int, end: int) -> int:
+    return max(content.rfind('"', start, end), content.rfind("'", start, end))
+
+def _first_quote(content: str, start: int, end: int) -> int:
+    double = content.find('"', start, end)
+    single = content.find("'", start, end)
+    return double if single == -1 or -1 < double < single else single
+
+def _call_end(content: str, call: int, end: int) -> int:
+    """Offset just past the ')' closing a .Translate( call, or -1 if it has no parameters."""
+    params = call + len(_TRANSLATE_CALL)
+    close = content.find(')', params, end)
+    return close + 1 if close > params else -1
+
+def find_translate_keys(content: str, start: int, end: int) -> List[str]:
+    """Find the keys of .Translate() calls with parameters in content[start:end].
+
+    Jumps between '.Translate(' literals and reads the key back from each one,
+    giving the same keys as findall with the regex described at _TRANSLATE_CALL.
+    """
+    keys = []
+    pos = start  # Where the previous call ended; keys can't reach back past it
+    call = content.find(_TRANSLATE_CALL, start, end)
+    while call != -1:
+        match_end = _call_end(content, call, end)
+        key = None
+        
+        if match_end != -1 and call > pos:
+            before = content[call - 1]
+            if before == '"' or before == "'":
+                # "Key".Translate(...): the key runs back to the previous quote
+                quote = _last_quote(content, pos, call - 1)
+                if quote != -1 and quote < call - 2:
+                    key = content[quote + 1:call - 1]
+            elif _is_word_char(before):
+                # Key.Translate(...): the key is the word ending at the call
+                key_start = call - 1
+                while key_start > pos and _is_word_char(content[key_start - 1]):
+                    key_start -= 1
+                key = content[key_start:call]
+                
+                # A quoted key that spans this whole call starts earlier, so it wins:
+                # "Some Key.Translate(x) text".Translate(y)
+                quote = _last_quote(content, pos, key_start)
+                if quote != -1:
+                    next_quote = _first_quote(content, call, end)
+                    if next_quote != -1 and content.startswith(_TRANSLATE_CALL, next_quote + 1):
+                        spanning_end = _call_end(content, next_quote + 1, end)
+                        if spanning_end != -1:
+                            key = content[quote + 1:next_quote]
+                            match_end = spanning_end
+        
+        if key is None:
+            call = content.find(_TRANSLATE_CALL, call + 1, end)
+        else:
+            keys.append(key)
+            pos = match_end
+            call = content.find(_TRANSLATE_CALL, pos, end)
+    
+    return keys
+
+def is_translation_key(key_name: str, key_value: str) -> bool:
+    """Check if an XML tag or attribute value looks like a translation key"""
+    return (key_name.lower() in _KEY_TAGS or
+            not key_value.startswith('{') and not key_value.isdigit())
+
+# Slotted: one instance is created per .Translate() call and pickled back from workers.
+# Fields are in output order, so unlinked calls serialize straight into the JSON.
+@dataclass(slots=True)
 class TranslationLink:
     translation_key: str
     csharp_file: str
     csharp_line: int
     csharp_code: str
-    xml_files: List[str] = None
 
 class TranslationLinker:
     def __init__(self):
@@ -27,114 +174,143 @@ class TranslationLinker:
     def find_translate_calls(self, csharp_dir: str = "Assembly-CSharp") -> List[TranslationLink]:
         """Find all .Translate() calls in C# files"""
         links = []
-        csharp_files = []
         
         # Find all C# files
-        for root, dirs, files in os.walk(csharp_dir):
-            for file in files:
-                if file.endswith('.cs'):
-                    csharp_files.append(os.path.join(root, file))
+        csharp_files = find_files(csharp_dir, '.cs')
         
         print(f"Found {len(csharp_files)} C# files")
         
-        # Process files in batches
+        # Process files in batches across worker processes
         batch_size = 100
-        for i in range(0, len(csharp_files), batch_size):
-            batch = csharp_files[i:i + batch_size]
-            print(f"Processing batch {i//batch_size + 1}/{(len(csharp_files) + batch_size - 1)//batch_size}")
-            
-            for file_path in batch:
-                file_links = self.parse_csharp_file(file_path)
+        errors = []
+        with ProcessPoolExecutor(initializer=_init_worker) as executor:
+            results = executor.map(_parse_csharp_file_in_worker, csharp_files, chunksize=batch_size)
+            for file_links, error in results:
+                if error:
+                    errors.append(error)
+                # Workers can't update our key set, so collect keys from their results.
+                # Keys arrive as fresh strings; interning shares one object per key
+                # with the XML index, so lookups there compare by identity.
+                for link in file_links:
+                    link.translation_key = sys.intern(link.translation_key)
+                    self.translation_keys.add(link.translation_key)
                 links.extend(file_links)
         
+        report_errors(errors)
         return links
     
     def parse_csharp_file(self, file_path: str) -> List[TranslationLink]:
-        """Parse C# file and find .Translate() calls"""
+        """Parse C# file and find .Translate() calls (read errors are raised)"""
         links = []
         
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+        content = read_translate_source(file_path)
+        if content is None:
+            return links
+        
+        # Jump between '.Translate(' occurrences in the whole content instead of
+        # looping over every line
+        line_num = 1
+        counted_to = 0
+        pos = content.find(_TRANSLATE_CALL)
+        while pos != -1:
+            line_start = content.rfind('\n', 0, pos) + 1
+            line_end = content.find('\n', pos)
+            if line_end == -1:
+                line_end = len(content)
             
-            for line_num, line in enumerate(lines, 1):
-                # Find .Translate() calls with parameters (actual replacements)
-                # Pattern: "Key".Translate(param1, param2, ...) or Key.Translate(param1, param2, ...)
-                translate_pattern = r'["\']([^"\']+)["\']\.Translate\([^)]+\)|(\w+)\.Translate\([^)]+\)'
-                matches = re.findall(translate_pattern, line)
-                
-                for match in matches:
-                    # match[0] is quoted string, match[1] is unquoted identifier
-                    translation_key = match[0] if match[0] else match[1]
-                    
-                    if translation_key:
-                        links.append(TranslationLink(
-                            translation_key=translation_key,
-                            csharp_file=file_path,
-                            csharp_line=line_num,
-                            csharp_code=line.strip()
-                        ))
-                        self.translation_keys.add(translation_key)
-        
-        except Exception as e:
-            print(f"Error parsing {file_path}: {e}")
+            # Newlines are counted only over the stretch skipped since the last hit
+            line_num += content.count('\n', counted_to, line_start)
+            counted_to = line_start
+            
+            # Find .Translate() calls with parameters (actual replacements),
+            # matching within this line only
+            translation_keys = find_translate_keys(content, line_start, line_end)
+            if translation_keys:
+                # All calls on a line share one copy of its code
+                csharp_code = content[line_start:line_end].strip()
+                for translation_key in translation_keys:
+                    links.append(TranslationLink(
+                        # Interned so repeated keys pickle once per batch
+                        translation_key=sys.intern(translation_key),
+                        csharp_file=file_path,
+                        csharp_line=line_num,
+                        csharp_code=csharp_code
+                    ))
+            
+            pos = content.find(_TRANSLATE_CALL, line_end)
         
         return links
     
     def find_xml_translation_keys(self, data_dir: str = "Data") -> Dict[str, List[str]]:
         """Find translation keys in XML files"""
-        key_to_files = {}
+        key_to_files = defaultdict(list)
         
         # Find all XML files
-        xml_files = []
-        for root, dirs, files in os.walk(data_dir):
-            for file in files:
-                if file.endswith('.xml'):
-                    xml_files.append(os.path.join(root, file))
+        xml_files = find_files(data_dir, '.xml')
         
         print(f"Scanning {len(xml_files)} XML files for translation keys...")
         
-        # Process files in batches
+        # Process files in batches across worker processes
         batch_size = 50
-        for i in range(0, len(xml_files), batch_size):
-            batch = xml_files[i:i + batch_size]
-            
-            for file_path in batch:
-                keys = self.parse_xml_translation_keys(file_path)
-                for key in keys:
-                    if key not in key_to_files:
-                        key_to_files[key] = []
+        errors = []
+        with ProcessPoolExecutor(initializer=_init_worker) as executor:
+            results = executor.map(_parse_xml_translation_keys_in_worker, xml_files, chunksize=batch_size)
+            for file_path, (keys, error) in zip(xml_files, results):
+                if error:
+                    errors.append(error)
+                for key in map(sys.intern, keys):
                     key_to_files[key].append(file_path)
         
-        return key_to_files
+        report_errors(errors)
+        return dict(key_to_files)
     
     def parse_xml_translation_keys(self, file_path: str) -> Set[str]:
-        """Parse XML file and find translation keys"""
+        """Parse XML file and find translation keys (read errors are raised)"""
+        try:
+            return self.parse_xml_elements(file_path)
+        except ET.ParseError:
+            # Malformed XML: fall back to scanning the raw text
+            return self.scan_xml_text(file_path)
+    
+    def parse_xml_elements(self, file_path: str) -> Set[str]:
+        """Find translation keys by streaming the file through ElementTree.iterparse.
+
+        Takes the text of attribute-less text-only elements and all attribute values,
+        so comments are skipped and CDATA and entities are decoded.
+        """
         keys = set()
         
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+        for _, elem in ET.iterparse(file_path, events=('end',)):
+            # <key>value</key>
+            text = elem.text
+            if text and not elem.attrib and len(elem) == 0 and is_translation_key(elem.tag, text):
+                keys.add(text)
             
-            # Look for translation keys in XML content
-            # Pattern: <key>TranslationKey</key> or key="TranslationKey"
-            key_patterns = [
-                r'<(\w+)>([^<]+)</\1>',  # <key>value</key>
-                r'(\w+)="([^"]+)"',      # key="value"
-            ]
+            # key="value"
+            for key_name, key_value in elem.attrib.items():
+                if key_value and is_translation_key(key_name, key_value):
+                    keys.add(key_value)
             
-            for pattern in key_patterns:
-                matches = re.findall(pattern, content)
-                for match in matches:
-                    if len(match) == 2:
-                        key_name, key_value = match
-                        # Check if this looks like a translation key
-                        if (key_name.lower() in ['key', 'defname', 'label', 'description', 'text'] or
-                            key_value and not key_value.startswith('{') and not key_value.isdigit()):
-                            keys.add(key_value)
-        
-        except Exception as e:
-            print(f"Error parsing {file_path}: {e}")
+            # Free the element's contents as soon as it has been read
+            elem.clear()
+        
+        return keys
+    
+    def scan_xml_text(self, file_path: str) -> Set[str]:
+        """Find translation keys in raw XML text with regexes (works on malformed files)."""
+        keys = set()
+        
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read()
+        
+        # Look for translation keys in XML content
+        for tag_name, tag_value, attr_name, attr_value in _XML_KEY_RE.findall(content):
+            if tag_name:
+                key_name, key_value = tag_name, tag_value
+            else:
+                key_name, key_value = attr_name, attr_value
+            if is_translation_key(key_name, key_value):
+                keys.add(key_value)
         
         return keys
     
@@ -148,19 +324,22 @@ class TranslationLinker:
         
         print("Linking translations...")
         
-        # Link C# calls to XML keys
-        linked_translations = {}
+        # Link C# calls to XML keys; unlinked calls are collected in the same pass
+        linked_translations = defaultdict(list)
+        unlinked_calls = []
         for link in csharp_links:
-            key = link.translation_key
-            if key in xml_keys:
-                if key not in linked_translations:
-                    linked_translations[key] = []
-                linked_translations[key].append({
+            # One lookup both tests for the key and fetches its XML files
+            xml_files = xml_keys.get(link.translation_key)
+            if xml_files is not None:
+                linked_translations[link.translation_key].append({
                     'csharp_file': link.csharp_file,
                     'csharp_line': link.csharp_line,
                     'csharp_code': link.csharp_code,
-                    'xml_files': xml_keys[key]
+                    'xml_files': xml_files
                 })
+            else:
+                # Its fields are exactly the unlinked record, so it is encoded as is
+                unlinked_calls.append(link)
         
         # Create output
         output = {
@@ -168,29 +347,95 @@ class TranslationLinker:
             'total_translate_calls': len(csharp_links),
             'unique_translation_keys': len(self.translation_keys),
             'linked_translations': len(linked_translations),
-            'translation_links': linked_translations,
-            'unlinked_csharp_calls': [
-                {
-                    'translation_key': link.translation_key,
-                    'csharp_file': link.csharp_file,
-                    'csharp_line': link.csharp_line,
-                    'csharp_code': link.csharp_code
-                }
-                for link in csharp_links
-                if link.translation_key not in xml_keys
-            ]
+            'translation_links': dict(linked_translations),
+            'unlinked_csharp_calls': unlinked_calls
         }
         
         return output
 
+# Each worker process gets its own linker for parsing files
+_worker_linker = None
+
+def _init_worker():
+    global _worker_linker
+    _worker_linker = TranslationLinker()
+
+# Workers return (result, error message) so errors are reported once by the parent
+def _parse_csharp_file_in_worker(file_path: str) -> Tuple[List[TranslationLink], Optional[str]]:
+    try:
+        return _worker_linker.parse_csharp_file(file_path), None
+    except Exception as e:
+        return [], f"{file_path}: {e}"
+
+def _parse_xml_translation_keys_in_worker(file_path: str) -> Tuple[Set[str], Optional[str]]:
+    try:
+        return _worker_linker.parse_xml_translation_keys(file_path), None
+    except Exception as e:
+        return set(), f"{file_path}: {e}"
+
+def report_errors(errors: List[str]):
+    """Print the files that could not be parsed, all at once"""
+    if errors:
+        print(f"Could not parse {len(errors)} files:\n  " + "\n  ".join(errors))
+
+def encode_json(value, level: int = 0) -> bytes:
+    """Encode value as UTF-8, 2-space indented JSON nested level levels deep.
+
+    Uses orjson when installed; its indented output matches the stdlib's.
+    Dataclasses are encoded as objects with their fields in declaration order.
+    """
+    if orjson is not None:
+        # orjson serializes dataclasses natively
+        encoded = orjson.dumps(value, option=orjson.OPT_INDENT_2)
+    else:
+        encoded = json.dumps(value, indent=2, ensure_ascii=False,
+                             default=_dataclass_to_dict).encode('utf-8')
+    
+    # Encoded strings never contain raw newlines, so every newline starts a line
+    if level:
+        encoded = encoded.replace(b'\n', b'\n' + b'  ' * level)
+    return encoded
+
+def _dataclass_to_dict(obj):
+    """json.dumps fallback for objects the stdlib encoder does not know."""
+    if is_dataclass(obj):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def write_json(data: Dict, output_file: str):
+    """Write data as 2-space indented JSON, streaming large sections item by item.
+
+    The text is the same as json.dump(data, f, indent=2, ensure_ascii=False), but
+    each entry of a top-level dict or list is encoded and written on its own, so
+    no encoder call ever holds more than one record.
+    """
+    with open(output_file, 'wb') as f:
+        f.write(b'{')
+        for i, (name, value) in enumerate(data.items()):
+            f.write(b',\n  ' if i else b'\n  ')
+            f.write(encode_json(name) + b': ')
+            
+            if isinstance(value, dict) and value:
+                for j, (key, item) in enumerate(value.items()):
+                    f.write(b',\n    ' if j else b'{\n    ')
+                    f.write(encode_json(key) + b': ' + encode_json(item, 2))
+                f.write(b'\n  }')
+            elif isinstance(value, list) and value:
+                for j, item in enumerate(value):
+                    f.write(b',\n    ' if j else b'[\n    ')
+                    f.write(encode_json(item, 2))
+                f.write(b'\n  ]')
+            else:
+                f.write(encode_json(value, 1))
+        f.write(b'\n}' if data else b'}')
+
 def main():
     linker = TranslationLinker()
     result = linker.link_translations()
     
     # Save to JSON
     output_file = 'translation_links.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(result, f, indent=2, ensure_ascii=False)
+    write_json(result, output_file)
     
     print(f"\nFound {result['total_translate_calls']} .Translate() calls")
     print(f"Found {result['unique_translation_keys']} unique translation keys")
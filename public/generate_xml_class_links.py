@@ -7,9 +7,16 @@ Uses existing docs_index.json to link XML tags to C# classes without parsing C#
 import json
 import os
 import re
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from dataclasses import dataclass
-from typing import List, Dict, Set
+from typing import List, Dict, Optional, Set
+
+try:
+    from lxml import etree
+except ImportError:  # lxml is optional; without it XML is scanned with a regex
+    etree = None
 
 @dataclass
 class XmlClassLink:
@@ -20,15 +27,32 @@ class XmlClassLink:
     xml_file: str
     xml_line: int
 
+def newline_offsets(text: str) -> List[int]:
+    """Return the offset of every newline in text, in ascending order"""
+    offsets = []
+    pos = text.find('\n')
+    while pos != -1:
+        offsets.append(pos)
+        pos = text.find('\n', pos + 1)
+    return offsets
+
 class XmlClassLinker:
-    def __init__(self):
-        self.csharp_classes = self.load_csharp_classes()
+    def __init__(self, csharp_classes: Optional[Dict[str, str]] = None):
+        if csharp_classes is None:
+            csharp_classes = self.load_csharp_classes()
+        self.csharp_classes = csharp_classes
         # Common XML tags that reference C# classes
         self.class_reference_tags = {
             'verbClass', 'compClass', 'defClass', 'thingClass', 'jobClass',
             'workType', 'skillDef', 'traitDef', 'hediffDef', 'abilityDef',
             'class', 'type', 'def', 'operation', 'patch'
         }
+        # One pattern for every tag: <tag ...>value</tag>, matched case-insensitively
+        self.tag_names = {tag.lower(): tag for tag in self.class_reference_tags}
+        self.tag_union_re = re.compile(
+            r'<(' + '|'.join(re.escape(tag) for tag in self.class_reference_tags) + r')\b[^>]*>([^<]*)</\1>',
+            re.IGNORECASE
+        )
     
     def load_csharp_classes(self) -> Dict[str, str]:
         """Load C# class names and their file paths from docs_index.json"""
@@ -46,29 +70,66 @@ class XmlClassLinker:
     
     def parse_xml_file(self, file_path: str) -> List[XmlClassLink]:
         """Parse XML file and find class references"""
+        if etree is not None:
+            try:
+                return self.parse_xml_elements(file_path)
+            except etree.XMLSyntaxError:
+                pass  # Not well-formed; fall back to scanning the raw text
+            except Exception as e:
+                print(f"Error parsing {file_path}: {e}")
+                return []
+        
+        return self.scan_xml_text(file_path)
+    
+    def parse_xml_elements(self, file_path: str) -> List[XmlClassLink]:
+        """Stream elements with lxml and find class references in their text"""
+        links = []
+        
+        for _, elem in etree.iterparse(file_path, events=('end',)):
+            # Tags are matched case-insensitively, like the regex scanner
+            tag = self.tag_names.get(elem.tag.lower())
+            if tag and elem.text and len(elem) == 0:
+                class_name = elem.text.strip()
+                if class_name in self.csharp_classes:
+                    links.append(XmlClassLink(
+                        xml_tag=tag,
+                        xml_value=class_name,
+                        csharp_class=class_name,
+                        csharp_file=self.csharp_classes[class_name],
+                        xml_file=file_path,
+                        xml_line=elem.sourceline
+                    ))
+            # Drop the parsed content; nothing else needs the tree
+            elem.clear(keep_tail=True)
+        
+        return links
+    
+    def scan_xml_text(self, file_path: str) -> List[XmlClassLink]:
+        """Scan raw XML text for class references with the tag-union regex"""
         links = []
         
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+                text = f.read()
             
-            for line_num, line in enumerate(lines, 1):
-                # Find XML tags that might reference C# classes
-                for tag in self.class_reference_tags:
-                    pattern = rf'<{tag}[^>]*>(.*?)</{tag}>'
-                    matches = re.findall(pattern, line, re.IGNORECASE)
-                    
-                    for match in matches:
-                        class_name = match.strip()
-                        if class_name in self.csharp_classes:
-                            links.append(XmlClassLink(
-                                xml_tag=tag,
-                                xml_value=class_name,
-                                csharp_class=class_name,
-                                csharp_file=self.csharp_classes[class_name],
-                                xml_file=file_path,
-                                xml_line=line_num
-                            ))
+            # Newline offsets for turning match positions into line numbers,
+            # built once per file and only if it has a link
+            newlines = None
+            
+            # Find XML tags that might reference C# classes in a single pass
+            for match in self.tag_union_re.finditer(text):
+                class_name = match.group(2).strip()
+                if class_name in self.csharp_classes:
+                    if newlines is None:
+                        newlines = newline_offsets(text)
+                    links.append(XmlClassLink(
+                        xml_tag=self.tag_names[match.group(1).lower()],
+                        xml_value=class_name,
+                        csharp_class=class_name,
+                        csharp_file=self.csharp_classes[class_name],
+                        xml_file=file_path,
+                        xml_line=bisect_right(newlines, match.start()) + 1
+                    ))
         
         except Exception as e:
             print(f"Error parsing {file_path}: {e}")
@@ -78,24 +139,24 @@ class XmlClassLinker:
     def scan_directory(self, data_dir: str) -> List[XmlClassLink]:
         """Scan Data directory for XML files"""
         all_links = []
-        xml_files = []
         
         # Find all XML files
-        for root, dirs, files in os.walk(data_dir):
-            for file in files:
-                if file.endswith('.xml'):
-                    xml_files.append(os.path.join(root, file))
+        xml_files = [
+            os.path.join(root, file)
+            for root, dirs, files in os.walk(data_dir)
+            for file in files
+            if file.endswith('.xml')
+        ]
         
         print(f"Found {len(xml_files)} XML files")
         
-        # Process files in batches
+        # Process files in batches across worker processes
         batch_size = 50
-        for i in range(0, len(xml_files), batch_size):
-            batch = xml_files[i:i + batch_size]
-            print(f"Processing batch {i//batch_size + 1}/{(len(xml_files) + batch_size - 1)//batch_size}")
-            
-            for file_path in batch:
-                links = self.parse_xml_file(file_path)
+        with ProcessPoolExecutor(initializer=_init_worker, initargs=(self.csharp_classes,)) as executor:
+            results = executor.map(_parse_xml_file_in_worker, xml_files, chunksize=batch_size)
+            for i, links in enumerate(results):
+                if i % batch_size == 0:
+                    print(f"Processing batch {i//batch_size + 1}/{(len(xml_files) + batch_size - 1)//batch_size}")
                 all_links.extend(links)
         
         return all_links
@@ -141,6 +202,16 @@ class XmlClassLinker:
         
         return output
 
+# Each worker process gets its own linker, built once from the parent's class index
+_worker_linker = None
+
+def _init_worker(csharp_classes: Dict[str, str]):
+    global _worker_linker
+    _worker_linker = XmlClassLinker(csharp_classes)
+
+def _parse_xml_file_in_worker(file_path: str) -> List[XmlClassLink]:
+    return _worker_linker.parse_xml_file(file_path)
+
 def main():
     linker = XmlClassLinker()
     result = linker.generate_class_links()